@@ -1,5 +1,6 @@
 import os
 import json
+import asyncio
 import traceback
 from argparse import ArgumentParser, Namespace
 from math import comb
@@ -12,6 +13,7 @@ file_lock = threading.Lock()
 from src.envs import get_env
 from src.agent_factory import get_agent
 from src.types import EnvRunResult, CostInfo
+from src.utils import backoff_delay, RETRYABLE_ERRORS
 from automatic_evaluation import role_fault_classification
 from dotenv import load_dotenv
 
@@ -34,6 +36,7 @@ def parse_arguments() -> Namespace:
     parser.add_argument("--end_index", type=int, required=False, default=-1, help="End index for tasks (-1 for all)")
     parser.add_argument("--task_ids", nargs='+', type=int, required=False, default=None, help="Specific task ids to run")
     parser.add_argument("--simulation_retry", type=int, required=False, default=10, help="Number of simulation retries")    
+    parser.add_argument("--history_char_budget", type=int, required=False, default=None, help="Prompt character budget before old tool outputs are compacted (default: no limit)")
     return parser.parse_args()
 
 def display_metrics(results: List[EnvRunResult]) -> None:
@@ -98,7 +101,8 @@ def run(config: Namespace):
             model=config.model,
             temperature=config.temperature,
             agent_strategy=config.agent_strategy,
-            rule=env.rule
+            rule=env.rule,
+            history_char_budget=config.history_char_budget,
         )
     
     total_tasks = len(env.tasks)
@@ -118,9 +122,11 @@ def run(config: Namespace):
     idx_to_run = idx * config.num_trials
     trials = [i for i in range(1, config.num_trials + 1) for _ in idx]
     
-    def _run(idx: int, trial: int) -> EnvRunResult:
+    async def _run(idx: int, trial: int) -> EnvRunResult:
         simulation_retry = 0
-        isolated_env = get_env(
+        transient_retry = 0
+        isolated_env = await asyncio.to_thread(
+            get_env,
             env_name=config.env,
             eval_mode=config.eval_mode,
             user_strategy=config.user_strategy,
@@ -130,7 +136,7 @@ def run(config: Namespace):
         exit_flag = False
         while True:
             try:
-                response = agent.run(env=isolated_env, task_index=idx)
+                response = await agent.arun(env=isolated_env, task_index=idx)
                 result = EnvRunResult(
                     task_idx=idx,
                     trial=trial,
@@ -146,11 +152,11 @@ def run(config: Namespace):
                 )
                 # valid mode: gold answer exists (task successful)
                 if response.reward == 1:
-                    update_checkpoint(ckpt_path, result, lock)
+                    await asyncio.to_thread(update_checkpoint, ckpt_path, result, lock)
                     exit_flag = True
                 # valid mode: gold answer exists (task failed)
                 elif response.reward == 0:
-                    fault_result = role_fault_classification({
+                    fault_result = await asyncio.to_thread(role_fault_classification, {
                         "messages": response.messages,
                         "instruction": isolated_env.task.instruction,
                         "gold_sql": isolated_env.task.gold_sql,
@@ -160,11 +166,11 @@ def run(config: Namespace):
                     if fault_result['role'] == 'agent' or simulation_retry == config.simulation_retry:
                         result.cost.eval_cost = round(fault_result['eval_cost'], 8)
                         result.cost.total_cost = round(result.cost.total_cost + fault_result['eval_cost'], 8)
-                        update_checkpoint(ckpt_path, result, lock)
+                        await asyncio.to_thread(update_checkpoint, ckpt_path, result, lock)
                         exit_flag = True
                 # test mode: gold answer does not exist (skip evaluation)
                 else:
-                    update_checkpoint(ckpt_path, result, lock)
+                    await asyncio.to_thread(update_checkpoint, ckpt_path, result, lock)
                     exit_flag = True
             except Exception as e:
                 result = EnvRunResult(
@@ -175,6 +181,17 @@ def run(config: Namespace):
                     messages=[],
                     cost=CostInfo()
                 )
+                if isinstance(e, RETRYABLE_ERRORS):
+                    # transient provider error (user simulator, evaluator, or the agent after its own retries):
+                    # back off and re-simulate without using the retry budget
+                    await asyncio.sleep(backoff_delay(transient_retry))
+                    transient_retry += 1
+                else:
+                    # any other failure counts toward the retry budget
+                    simulation_retry += 1
+                    if simulation_retry >= config.simulation_retry:
+                        await asyncio.to_thread(update_checkpoint, ckpt_path, result, lock)
+                        exit_flag = True
             if exit_flag:
                 break
             print(f"Retrying... {simulation_retry}/{config.simulation_retry}", f"task_id={idx}", result.info)
@@ -185,13 +202,28 @@ def run(config: Namespace):
             print(f"task_id={idx}", result.info)
         return result
 
-    with ThreadPoolExecutor(max_workers=config.max_concurrency) as executor:
-        res = list(executor.map(_run, idx_to_run, trials))
-        results.extend(res)
+    async def _run_all() -> List[EnvRunResult]:
+        # each in-flight task blocks at most one worker thread at a time (user LLM, env, evaluation)
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=config.max_concurrency))
+        semaphore = asyncio.Semaphore(config.max_concurrency)
+
+        async def _bounded_run(idx: int, trial: int) -> EnvRunResult:
+            async with semaphore:
+                return await _run(idx, trial)
+
+        return await asyncio.gather(*(_bounded_run(i, t) for i, t in zip(idx_to_run, trials)))
+
+    results.extend(asyncio.run(_run_all()))
 
     if config.eval_mode == "valid":
         display_metrics(results)
 
 if __name__ == "__main__":
     config = parse_arguments()
+    try:
+        # optional: uvloop has cheaper task switching for large --max_concurrency fan-outs
+        import uvloop
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
+    except ImportError:
+        pass
     run(config)
\ No newline at end of file
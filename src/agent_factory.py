@@ -7,6 +7,7 @@ def get_agent(
     agent_strategy: str = "tool-calling",
     temperature: float = 0.0,
     rule: str = "",
+    history_char_budget: Optional[int] = None,
 ) -> Agent:
     if agent_strategy == "tool-calling":
         from src.agents.tool_calling_agent import ToolCallingAgent
@@ -15,6 +16,7 @@ def get_agent(
             model=model,
             temperature=temperature,
             rule=rule,
+            history_char_budget=history_char_budget,
         )
     else:
         # TODO: implement your own agent and return it here
@@ -1,4 +1,5 @@
 import abc
+import asyncio
 from typing import Optional
 from src.envs.base import Env
 from src.types import AgentRunResult
@@ -9,3 +10,10 @@ class Agent(abc.ABC):
         self, env: Env, task_index: Optional[int] = None, max_num_steps: int = 30
     ) -> AgentRunResult:
         raise NotImplementedError
+
+    async def arun(
+        self, env: Env, task_index: Optional[int] = None, max_num_steps: int = 30
+    ) -> AgentRunResult:
+        """Entry point used by run.py. By default the blocking `run` is executed in a worker thread,
+        so an agent only has to implement `run`; agents with a native async loop override this too."""
+        return await asyncio.to_thread(self.run, env, task_index, max_num_steps)
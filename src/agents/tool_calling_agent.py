@@ -1,11 +1,12 @@
-import time
-from litellm import completion
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from litellm import acompletion
 from typing import List, Optional, Dict, Any
 
 from src.agents.base import Agent
 from src.envs.base import Env
 from src.types import AgentRunResult
-from src.utils import convert_message_to_action
+from src.utils import convert_message_to_action, backoff_delay, RETRYABLE_ERRORS
 
 TOOL_CALLING_INSTRUCTION = """- You are a SQL agent that translates natural language questions into precise SQL queries for electronic health records (EHR).
 - You are currently engaged in a conversation with a user who wants to retrieve data from an EHR database.
@@ -21,6 +22,8 @@ TOOL_CALLING_INSTRUCTION = """- You are a SQL agent that translates natural lang
 - Your performance is evaluated based on the latest SQL query you generate, so when generating a new SQL query for the user's request, avoid relying on previous results but instead rewrite it from scratch to fully capture the user's intent and ensure it is accurately assessed.
 """
 
+MAX_COMPLETION_ATTEMPTS = 8
+
 class ToolCallingAgent(Agent):
     def __init__(
         self,
@@ -28,53 +31,68 @@ class ToolCallingAgent(Agent):
         rule: str,
         model: str,
         temperature: float = 0.0,
+        history_char_budget: Optional[int] = None,
     ):
         self.tools_info = tools_info
         self.rule = rule
         self.model = model
         self.temperature = temperature
+        # None keeps the full history in every prompt
+        self.history_char_budget = history_char_budget
         self.instruction = TOOL_CALLING_INSTRUCTION + '\nRules:\n'+self.rule
+        self.system_message = {"role": "system", "content": self.instruction}
 
     def run(
         self, env: Env, task_index: Optional[int] = None, max_num_steps: int = 30
+    ) -> AgentRunResult:
+        coro = self._arun(env=env, task_index=task_index, max_num_steps=max_num_steps)
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(coro)
+        # called from a running event loop (e.g. Jupyter/Colab): run on a private loop in a worker thread
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            return executor.submit(asyncio.run, coro).result()
+
+    async def arun(
+        self, env: Env, task_index: Optional[int] = None, max_num_steps: int = 30
+    ) -> AgentRunResult:
+        if type(self).run is not ToolCallingAgent.run:
+            # a subclass customized the blocking loop; drive that one instead of the native async loop
+            return await super().arun(env=env, task_index=task_index, max_num_steps=max_num_steps)
+        return await self._arun(env=env, task_index=task_index, max_num_steps=max_num_steps)
+
+    async def _arun(
+        self, env: Env, task_index: Optional[int] = None, max_num_steps: int = 30
     ) -> AgentRunResult:
         agent_cost = 0.0
-        env_reset_res = env.reset(task_index=task_index)
+        # the env talks to the user LLM and the database synchronously, so keep it off the event loop
+        env_reset_res = await asyncio.to_thread(env.reset, task_index=task_index)
         obs_user = env_reset_res.observation
         env_info = env_reset_res.info.model_dump()
         reward = 0.0
         messages: List[Dict[str, Any]] = [
-            {"role": "system", "content": self.instruction},
+            self.system_message,
             {"role": "user", "content": obs_user},
         ]
         for _ in range(max_num_steps):
-            while True:
-                try:
-                    res = completion(
-                        messages=messages,
-                        model=self.model,
-                        tools=self.tools_info,
-                        temperature=self.temperature,
-                    )
-                    agent_cost += res._hidden_params["response_cost"]
-                    break
-                except Exception as e:
-                    time.sleep(3)
-                    print(e, end='\r')
+            res = await self._acompletion_with_retry(self._compact_history(messages))
+            agent_cost += res._hidden_params.get("response_cost") or 0.0
             next_message = res.choices[0].message.model_dump()
             action = convert_message_to_action(next_message)
-            env_response = env.step(action)
+            env_response = await asyncio.to_thread(env.step, action)
             reward = env_response.reward
-            env_info = {**env_info, **env_response.info.model_dump()}
+            env_info.update(env_response.info.model_dump())
             if action.name != 'respond':
-                next_message["tool_calls"] = next_message["tool_calls"][:1]
+                tool_call = next_message["tool_calls"][0]
+                next_message["tool_calls"] = [tool_call]
                 messages.extend(
                     [
                         next_message,
                         {
                             "role": "tool",
-                            "tool_call_id": next_message["tool_calls"][0]["id"],
-                            "name": next_message["tool_calls"][0]["function"]["name"],
+                            "tool_call_id": tool_call["id"],
+                            "name": action.name,
                             "content": env_response.observation,
                         },
                     ]
@@ -96,3 +114,41 @@ class ToolCallingAgent(Agent):
             info=env_info
         )
 
+    async def _acompletion_with_retry(self, messages: List[Dict[str, Any]]) -> Any:
+        for attempt in range(MAX_COMPLETION_ATTEMPTS):
+            try:
+                return await acompletion(
+                    messages=messages,
+                    model=self.model,
+                    tools=self.tools_info,
+                    temperature=self.temperature,
+                )
+            except RETRYABLE_ERRORS as e:
+                if attempt == MAX_COMPLETION_ATTEMPTS - 1:
+                    raise
+                print(e, end='\r')
+                await asyncio.sleep(backoff_delay(attempt))
+
+    def _compact_history(self, messages: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Shorten the oldest tool observations in the prompt until it fits `history_char_budget`.
+
+        Only the prompt copy is compacted; the transcript returned in AgentRunResult keeps every
+        observation. Tool messages are replaced in place (not dropped) so each tool call keeps its answer,
+        and the latest observation is always kept verbatim.
+        """
+        if self.history_char_budget is None:
+            return messages
+        total = sum(len(m.get("content") or "") for m in messages)
+        if total <= self.history_char_budget:
+            return messages
+        compacted = list(messages)
+        tool_indices = [i for i, m in enumerate(messages) if m["role"] == "tool"][:-1]
+        for i in tool_indices:
+            if total <= self.history_char_budget:
+                break
+            content = compacted[i]["content"] or ""
+            summary = f"(earlier {compacted[i]['name']} output omitted: {len(content)} characters)"
+            if len(summary) < len(content):
+                compacted[i] = {**compacted[i], "content": summary}
+                total -= len(content) - len(summary)
+        return compacted
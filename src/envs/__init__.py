@@ -7,6 +7,7 @@ def get_env(
     user_strategy: str,
     user_model: Optional[str] = None,
     task_index: Optional[int] = None,
+    tool_profile: str = "basic",
 ) -> Env:
     if env_name == "mimic_iv":
         from src.envs.mimic_iv import MimicIVEnv
@@ -15,6 +16,7 @@ def get_env(
             user_strategy=user_strategy,
             user_model=user_model,
             task_index=task_index,
+            tool_profile=tool_profile,
         )
     else:
         raise ValueError(f"Unknown environment: {env_name}")
@@ -26,10 +26,10 @@ class Env(object):
         rule: Optional[str] = None,
     ) -> None:
         super().__init__()
+        self.tools_info = [tool.get_info() for tool in tools]
         self.tools_map: Dict[str, Type[Tool]] = {
-            tool.get_info()["function"]["name"]: tool for tool in tools
+            info["function"]["name"]: tool for info, tool in zip(self.tools_info, tools)
         }
-        self.tools_info = [tool.get_info() for tool in tools]
         self.tasks = tasks
         if task_index is not None:
             self.task_index = task_index
@@ -96,7 +96,8 @@ class Env(object):
             if action.name == 'sql_db_query':
                 last_sql = action
         if last_sql:
-            conn = sqlite3.connect(self.db_path)
+            # open read-only: the tools' engine treats the database file as immutable
+            conn = sqlite3.connect(f"file:{os.path.abspath(self.db_path)}?mode=ro", uri=True)
             cursor = conn.cursor()
 
             try:
@@ -112,8 +113,10 @@ class Env(object):
                     # returning multiple columns
                     else:
                         converted_pred_sql_answer = list(zip(*pred_sql_answer))
+                        # compare distinct values as sets; the gold set is the same for every column
+                        gold_values = {el[0] for el in gold_answer}
                         for i in range(len(converted_pred_sql_answer)):
-                            if sorted(set([r for r in converted_pred_sql_answer[i] if r != 'None'])) == sorted(set([el[0] for el in gold_answer])):
+                            if {r for r in converted_pred_sql_answer[i] if r != 'None'} == gold_values:
                                 reward = 1.0
                                 break
             except sqlite3.Error as e:
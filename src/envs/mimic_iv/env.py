@@ -1,16 +1,68 @@
 import os
 import json
+import importlib
+from functools import lru_cache
+from typing import Any, Dict, Tuple, Type
 from src.types import Task
 from src.envs.base import Env
-from src.envs.mimic_iv.tools.sql_db_list_tables import SqlDbListTables
-from src.envs.mimic_iv.tools.sql_db_schema import SqlDbSchema
-from src.envs.mimic_iv.tools.sql_db_query import SqlDbQuery
-from src.envs.mimic_iv.tools.value_substring_search import ValueSubstringSearch
-# TODO: import your own tools here
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine
 
 FOLDER_PATH = os.path.dirname(__file__)
 
+# Tools exposed to the agent, per tool profile, as "module:ClassName" paths. Modules are only
+# imported when a profile using them is constructed. Each tool is instantiated once per database
+# with the shared engine and reused by every env, so tools must not keep per-task state.
+TOOL_PROFILES: Dict[str, Tuple[str, ...]] = {
+    "basic": (
+        "src.envs.mimic_iv.tools.sql_db_list_tables:SqlDbListTables",
+        "src.envs.mimic_iv.tools.sql_db_schema:SqlDbSchema",
+        "src.envs.mimic_iv.tools.value_substring_search:ValueSubstringSearch",
+        "src.envs.mimic_iv.tools.sql_db_query:SqlDbQuery",
+    ),
+    # TODO: add your own tools / tool profiles here
+}
+
+@lru_cache(maxsize=None)
+def _resolve_tool_class(path: str) -> Type:
+    module_name, class_name = path.split(":")
+    return getattr(importlib.import_module(module_name), class_name)
+
+@lru_cache(maxsize=None)
+def _load_tasks(eval_mode: str) -> Tuple[Tuple[Task, ...], str]:
+    # Task files and rules are static for the whole run; parse and validate them once per eval mode.
+    with open(os.path.join(FOLDER_PATH, f"{eval_mode}_data.json"), "r") as f:
+        tasks = tuple(Task(**kwargs) for kwargs in json.load(f))
+    with open(os.path.join(FOLDER_PATH, "rules.txt"), "r") as f:
+        rule = f.read()
+    return tasks, rule
+
+@lru_cache(maxsize=4)
+def _get_engine(db_path: str) -> Engine:
+    # One engine (and connection pool) per database file, shared by every env instance.
+    # The database is read-only during evaluation, so open it immutable and let SQLite skip locking.
+    engine = create_engine(
+        f"sqlite:///file:{os.path.abspath(db_path)}?mode=ro&immutable=1&uri=true",
+        connect_args={"check_same_thread": False},
+    )
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record):
+        # Memory-map the (small, read-only) database and keep sorter/GROUP BY temp tables in memory.
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA query_only = 1")
+        cursor.execute("PRAGMA mmap_size = 268435456")
+        cursor.execute("PRAGMA cache_size = -65536")
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        cursor.close()
+
+    return engine
+
+@lru_cache(maxsize=None)
+def _build_tools(tool_profile: str, db_path: str) -> Tuple[Any, ...]:
+    engine = _get_engine(db_path)
+    return tuple(_resolve_tool_class(path)(engine=engine) for path in TOOL_PROFILES[tool_profile])
+
 class MimicIVEnv(Env):
     def __init__(
         self,
@@ -19,27 +71,16 @@ class MimicIVEnv(Env):
         user_model: str,
         task_index: int,
         db_path: str = "src/envs/mimic_iv/mimic_iv.sqlite",
+        tool_profile: str = "basic",
     ):
         assert os.path.exists(db_path), f"Database file does not exist: {db_path}"
-        with open(os.path.join(FOLDER_PATH, f"{eval_mode}_data.json"), "r") as f:
-            tasks = [Task(**kwargs) for kwargs in json.load(f)]
-        with open(os.path.join(FOLDER_PATH, "rules.txt"), "r") as f:
-            rule = f.read()
-        engine = create_engine(f"sqlite:///{db_path}")
-        sql_db_list_tables = SqlDbListTables(engine=engine)
-        sql_db_schema = SqlDbSchema(engine=engine)
-        sql_db_query = SqlDbQuery(engine=engine)
-        value_substring_search = ValueSubstringSearch(engine=engine)
+        if tool_profile not in TOOL_PROFILES:
+            raise ValueError(f"Unknown tool profile: {tool_profile}")
+        tasks, rule = _load_tasks(eval_mode)
 
         super().__init__(
-            tools=[
-                sql_db_list_tables,
-                sql_db_schema,
-                value_substring_search,
-                sql_db_query,
-                # TODO: add your own tools here
-            ],
-            tasks=tasks,
+            tools=list(_build_tools(tool_profile, db_path)),
+            tasks=list(tasks),
             user_strategy=user_strategy,
             user_model=user_model,
             db_path=db_path,
@@ -0,0 +1,63 @@
+import json
+import inspect
+import threading
+from functools import wraps
+from typing import Any, Callable, Dict, Tuple
+
+# Tools that only read from the database return the same observation for the same arguments,
+# so their results can be shared across tasks. Tools that act on the world must not be cached.
+INFORMATIONAL = "INFORMATIONAL"
+COMMAND = "COMMAND"
+
+class ToolResultCache:
+    """Process-wide memo of tool observations keyed by (tool, database URL, canonical JSON of the arguments).
+
+    Concurrent identical calls are single-flighted: the first caller computes the observation
+    while the others wait on a per-key lock and then reuse it. No invalidation is needed since
+    the database is read-only during evaluation.
+    """
+    def __init__(self) -> None:
+        self._results: Dict[Tuple[str, str, str], str] = {}
+        self._locks: Dict[Tuple[str, str, str], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def get_or_compute(self, key: Tuple[str, str, str], compute: Callable[[], str]) -> str:
+        with self._guard:
+            if key in self._results:
+                return self._results[key]
+            key_lock = self._locks.setdefault(key, threading.Lock())
+        with key_lock:
+            with self._guard:
+                if key in self._results:
+                    return self._results[key]
+            result = compute()
+            with self._guard:
+                self._results[key] = result
+                self._locks.pop(key, None)
+        return result
+
+TOOL_RESULT_CACHE = ToolResultCache()
+
+def cacheable(kind: str = INFORMATIONAL) -> Callable[[Callable[..., str]], Callable[..., str]]:
+    """Decorate a tool's `invoke` so INFORMATIONAL tools share results through TOOL_RESULT_CACHE."""
+    def decorator(invoke: Callable[..., str]) -> Callable[..., str]:
+        if kind != INFORMATIONAL:
+            return invoke
+        signature = inspect.signature(invoke)
+        tool_name = invoke.__qualname__
+
+        @wraps(invoke)
+        def wrapper(self: Any, *args: Any, **kwargs: Any) -> str:
+            try:
+                bound = signature.bind(self, *args, **kwargs)
+            except TypeError:
+                # bad arguments: let invoke raise its own error so the observation names the tool and the cause
+                return invoke(self, *args, **kwargs)
+            bound.apply_defaults()
+            arguments = {name: value for name, value in bound.arguments.items() if name != "self"}
+            engine = getattr(self, "engine", None)
+            database = str(engine.url) if engine is not None else ""
+            key = (tool_name, database, json.dumps(arguments, sort_keys=True, default=str))
+            return TOOL_RESULT_CACHE.get_or_compute(key, lambda: invoke(self, *args, **kwargs))
+        return wrapper
+    return decorator
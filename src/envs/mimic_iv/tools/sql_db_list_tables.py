@@ -2,6 +2,7 @@ from typing import Dict, Any
 from pydantic import BaseModel, Field
 from sqlalchemy.engine import Engine
 from sqlalchemy import inspect
+from src.envs.mimic_iv.tool_cache import cacheable, INFORMATIONAL
 
 class SqlDbListTables(BaseModel):
     engine: Engine = Field(..., description="The engine to list tables from.")
@@ -9,6 +10,7 @@ class SqlDbListTables(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
+    @cacheable(kind=INFORMATIONAL)
     def invoke(self, tool_input: str = "") -> str:
         inspector = inspect(self.engine)
         tables = inspector.get_table_names()
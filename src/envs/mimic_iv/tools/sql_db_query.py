@@ -3,6 +3,7 @@ from sqlalchemy import text
 from sqlalchemy.engine import Engine
 from sqlalchemy.exc import SQLAlchemyError
 from pydantic import BaseModel, Field
+from src.envs.mimic_iv.tool_cache import cacheable, COMMAND
 
 class SqlDbQuery(BaseModel):
     engine: Engine = Field(..., description="The engine to execute queries on.")
@@ -10,6 +11,7 @@ class SqlDbQuery(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
+    @cacheable(kind=COMMAND)
     def invoke(self, query: str, k: int = 100) -> str:
         result = ""
         try:
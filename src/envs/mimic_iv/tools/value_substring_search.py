@@ -4,6 +4,7 @@ from typing import Dict, Any
 from sqlalchemy import text
 from sqlalchemy.engine import Engine
 from pydantic import BaseModel, Field
+from src.envs.mimic_iv.tool_cache import cacheable, INFORMATIONAL
 
 class ValueSubstringSearch(BaseModel):
     engine: Engine = Field(..., description="The engine to retrieve sample values from.")
@@ -11,31 +12,22 @@ class ValueSubstringSearch(BaseModel):
     class Config:
         arbitrary_types_allowed = True
 
+    @cacheable(kind=INFORMATIONAL)
     def invoke(self, table: str, column: str, value: str, k: int = 100) -> str:
         try:
             pattern = f"%{value}%"
             with self.engine.connect() as connection:
-                # Step 1: Count total matching distinct values
-                count_query = text(
-                    f"SELECT COUNT(DISTINCT {column}) FROM {table} WHERE {column} LIKE :pattern COLLATE NOCASE"
-                )
-                count_result = connection.execute(count_query, {"pattern": pattern})
-                n = count_result.scalar()
-                if n is None:
-                    return f"Error: Unable to count matches in {table}.{column} for '{value}'."
-                
-                # Step 2: Retrieve up to k matching distinct values
+                # Retrieve up to k matching distinct values; NULLs never satisfy LIKE
                 query = text(
                     f"SELECT DISTINCT {column} FROM {table} WHERE {column} LIKE :pattern COLLATE NOCASE LIMIT {k}"
                 )
-                res = connection.execute(query, {"pattern": pattern})
-                matching_vals = [row[0] for row in res if row[0] is not None]
-                matching_vals = list(set(matching_vals))  # Ensure uniqueness
+                # SELECT DISTINCT already deduplicates; keep SQLite's order so the observation is reproducible
+                matching_vals = connection.execute(query, {"pattern": pattern}).scalars().all()
 
                 if not matching_vals:
                     return f"No values in {table}.{column} contain '{value}'."
                 
-                # Step 3: Construct the response
+                # Construct the response
                 base_response = f"Values in {table}.{column} containing '{value}': {matching_vals}."
                 return base_response
         except Exception as e:
@@ -1,35 +1,56 @@
 import json
 import re
+import heapq
+import random
 from ast import literal_eval
 from typing import Dict, Any
+from litellm import (
+    APIConnectionError,
+    BadGatewayError,
+    InternalServerError,
+    RateLimitError,
+    ServiceUnavailableError,
+    Timeout,
+)
 from src.types import Action
 
+# Transient provider errors worth retrying; anything else (auth, bad request, context length) surfaces immediately.
+RETRYABLE_ERRORS = (RateLimitError, APIConnectionError, Timeout, InternalServerError, BadGatewayError, ServiceUnavailableError)
+BACKOFF_BASE = 0.5
+BACKOFF_MAX = 30.0
+
+SQL_BLOCK_PATTERN = re.compile(r'```sql([\s\S]*?)```')
+
+def backoff_delay(attempt: int) -> float:
+    # exponential backoff with full jitter so concurrent tasks don't retry in lockstep
+    return random.uniform(0, min(BACKOFF_MAX, BACKOFF_BASE * 2 ** min(attempt, 16)))
+
 def parse_sql(response: str) -> str:
-    pattern = r'```sql([\s\S]*?)```'
-    matches = re.findall(pattern, response)
+    matches = SQL_BLOCK_PATTERN.findall(response)
     if matches:
         return matches[-1].strip()
     stripped = response.strip()
-    if stripped.lower().startswith("select") or stripped.lower().startswith("with"):
+    if stripped.lower().startswith(("select", "with")):
         return stripped
     raise ValueError("No SQL found in the response")
 
 def process_item(item):
     try:
         item = round(float(item),3)
-    except:
+    except (TypeError, ValueError, OverflowError):
         pass
     return str(item)
 
 def process_result(result):
     try:
         result = literal_eval(result)
-    except:
+    except (ValueError, TypeError, SyntaxError, MemoryError, RecursionError):
         pass
     if type(result)==str:
         return result
     else:
-        return sorted([[process_item(c) for c in row] for row in result])[:100] # only compare first 100 results
+        # only compare first 100 results (in sorted order)
+        return heapq.nsmallest(100, ([process_item(c) for c in row] for row in result))
 
 def convert_message_to_action(
     message: Dict[str, Any],
@@ -9,6 +9,7 @@ import pandas as pd
 import re
 
 DATA_DIR = "results"
+RESULT_DATE_PATTERN = re.compile(r'_(\d{10})_(valid|test)\.json$')
 
 # @st.cache_data
 def load_json_files(directory):
@@ -16,7 +17,7 @@ def load_json_files(directory):
     for f in os.listdir(directory):
         if f.endswith(".json"):
             # Extract the date from filename (last part after underscore)
-            date_match = re.search(r'_(\d{10})_(valid|test)\.json$', f)
+            date_match = RESULT_DATE_PATTERN.search(f)
             if date_match:
                 date_str = date_match.group(1)
                 json_files.append((f, date_str))